@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from functools import partial
 from typing import Callable, List, Union
 
+import jax
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
 import sax
@@ -120,6 +121,38 @@ class ClassicalResult(SimulationResult):
     detectors: list[Detector]
 
 
+@jax.jit
+def _run_core(entries, wl: ArrayLike, amps: ArrayLike, resp: ArrayLike):
+    """Compute detector fields and powers for a classical simulation.
+
+    Parameters
+    ----------
+    entries : tuple of tuple of ArrayLike
+        The s-parameter from each laser to each detector, indexed
+        ``entries[detector][laser]``. Each is broadcast to the shape of ``wl``.
+    wl : ArrayLike
+        The wavelengths being simulated.
+    amps : ArrayLike
+        Complex amplitude of each laser, shape (L,).
+    resp : ArrayLike
+        Responsivity of each detector, shape (D,).
+
+    Returns
+    -------
+    out, power
+        The complex field and the detected power at each detector, both of
+        shape (D, wl).
+    """
+    # built under jit, so gathering the (D, L, wl) block is part of the same
+    # compiled call rather than one dispatch per laser-detector pair
+    block = jnp.stack(
+        [jnp.stack([jnp.broadcast_to(s, wl.shape) for s in row]) for row in entries]
+    )
+    out = jnp.einsum("l,dlw->dw", amps, block)
+    power = (jnp.abs(out) ** 2) * resp[:, None]
+    return out, power
+
+
 class ClassicalSim(Simulation):
     """Classical simulation."""
 
@@ -225,17 +258,30 @@ class ClassicalSim(Simulation):
         ClassicalResult
             The simulation results.
         """
-        S = self.ckt()
+        S = self._sdict()
+
+        in_ports = list(self.lasers)
+        out_ports = list(self.detectors)
+
+        # Complex amplitude of every laser, shape (L,)
+        laser_power = jnp.array([self.lasers[port].power for port in in_ports])
+        laser_phase = jnp.array([self.lasers[port].phase for port in in_ports])
+        amps = jnp.sqrt(laser_power) * jnp.exp(1j * laser_phase)
+        resp = jnp.array([self.detectors[port].responsivity for port in out_ports])
+
+        if in_ports and out_ports:
+            # All detector responses are computed in a single compiled call.
+            entries = tuple(tuple(S[o, i] for i in in_ports) for o in out_ports)
+            out, power = _run_core(entries, jnp.asarray(self.wl), amps, resp)
+        else:
+            # Nothing to compute: without lasers every detector sees no light.
+            out = jnp.zeros((len(out_ports),) + jnp.shape(self.wl), jnp.complex64)
+            power = jnp.zeros(out.shape)
 
         sdict = {}
-        for output_port in self.detectors:
-            responses = []
-            for input_port in self.lasers:
-                signal = jnp.sqrt(self.lasers[input_port].power) * jnp.exp(
-                    1j * self.lasers[input_port].phase
-                )
-                responses.append(S[output_port, input_port] * signal)
-            sdict[output_port] = jnp.sum(jnp.asarray(responses), axis=0)
+        for d, port in enumerate(out_ports):
+            sdict[port] = out[d]
+            self.detectors[port].set_result(wl=self.wl, power=power[d])
 
         # # Create input vector from all lasers
         # src_v = jnp.zeros((len(self.wl), len(ports)), dtype=jnp.complex64)
@@ -247,10 +293,6 @@ class ClassicalSim(Simulation):
         #         raise NotImplementedError
         #         # src_v = src_v.at[:,idx].set(laser.mod_function(self.wl) * jnp.sqrt(laser.power))
 
-        for port, detector in self.detectors.items():
-            power = (jnp.abs(sdict[port]) ** 2) * detector.responsivity
-            detector.set_result(wl=self.wl, power=power)
-
         result = ClassicalResult(
             wl=self.wl,
             sdict=sdict,
@@ -10,6 +10,8 @@ devices, giving greater speed and similar accuracy to a full FDTD
 simulation.
 """
 
+from collections import OrderedDict
+from functools import wraps
 from itertools import product
 from typing import Callable, Union
 
@@ -27,6 +29,60 @@ except ImportError as exc:
     ) from exc
 
 
+_CACHE_SIZE = 64
+
+
+def _freeze(value):
+    """Convert a model argument into a hashable cache key component.
+
+    Numeric arrays (including wavelength grids) are keyed by their shape,
+    dtype and raw bytes; everything else, including gap functions, must
+    already be hashable. Any other value raises a ``TypeError`` so the call
+    bypasses the cache.
+    """
+    if isinstance(value, (list, tuple)) or hasattr(value, "__array__"):
+        try:
+            arr = np.asarray(value)
+        except ValueError as exc:
+            raise TypeError("ragged arrays can't be cached") from exc
+        # the bytes of object arrays are pointers, which may be reused
+        if arr.dtype.kind not in "biufc":
+            raise TypeError(f"'{arr.dtype}' arrays can't be cached")
+        return (arr.shape, arr.dtype.str, arr.tobytes())
+    hash(value)
+    return value
+
+
+def _memoize(func):
+    """Cache the s-parameters returned by a SiPANN model.
+
+    Evaluating a SiPANN model runs a neural network forward pass, so calling
+    the same model with the same geometry and wavelengths repeatedly (as
+    circuits and tests often do) is wasteful. Results are kept in a small
+    least-recently-used cache keyed on the keyword arguments. Each call
+    returns a fresh copy so callers may freely modify the result.
+    """
+    cache = OrderedDict()
+
+    @wraps(func)
+    def wrapper(**kwargs):
+        try:
+            key = tuple(sorted((k, _freeze(v)) for k, v in kwargs.items()))
+        except TypeError:
+            return func(**kwargs)
+
+        if key in cache:
+            cache.move_to_end(key)
+        else:
+            cache[key] = func(**kwargs)
+            if len(cache) > _CACHE_SIZE:
+                cache.popitem(last=False)
+        return {k: v.copy() for k, v in cache[key].items()}
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
 def _create_sdict_from_model(model, wl: Union[float, ArrayLike]) -> sax.SDict:
     """Create s-parameter dict from model.
 
@@ -53,6 +109,7 @@ def _create_sdict_from_model(model, wl: Union[float, ArrayLike]) -> sax.SDict:
     return sdict
 
 
+@_memoize
 def gap_func_symmetric(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -110,6 +167,7 @@ def gap_func_symmetric(
     return sdict
 
 
+@_memoize
 def gap_func_antisymmetric(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -179,6 +237,7 @@ def gap_func_antisymmetric(
     return sdict
 
 
+@_memoize
 def half_ring(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -232,6 +291,7 @@ def half_ring(
     return sdict
 
 
+@_memoize
 def straight_coupler(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -283,6 +343,7 @@ def straight_coupler(
     return sdict
 
 
+@_memoize
 def standard_coupler(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -343,6 +404,7 @@ def standard_coupler(
     return sdict
 
 
+@_memoize
 def double_half_ring(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -398,6 +460,7 @@ def double_half_ring(
     return sdict
 
 
+@_memoize
 def angled_half_ring(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -458,6 +521,7 @@ def angled_half_ring(
     return sdict
 
 
+@_memoize
 def waveguide(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -498,6 +562,7 @@ def waveguide(
     return sdict
 
 
+@_memoize
 def racetrack(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -557,6 +622,7 @@ def racetrack(
     return sdict
 
 
+@_memoize
 def premade_coupler(
     *,
     wl: Union[float, ArrayLike] = 1.55,
@@ -5,12 +5,12 @@ from functools import partial
 from math import comb
 from typing import List, Union
 
+import jax
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
 from jax.typing import ArrayLike
 from mpl_toolkits.mplot3d import Axes3D
 from sax.saxtypes import Model
-from sax.utils import get_ports
 
 from simphony.exceptions import ShapeMismatchError
 from simphony.simulation import SimDevice, Simulation, SimulationResult
@@ -461,6 +461,61 @@ def compose_qstate(*args: QuantumState) -> QuantumState:
     )
 
 
+def _symplectic(unitary: ArrayLike) -> ArrayLike:
+    """Builds the real symplectic form ``T = [[R, -I], [I, R]]`` of a mode
+    unitary, which acts on quadratures in the xxpp convention.
+
+    Parameters
+    ----------
+    unitary : ArrayLike
+        The complex unitary acting on the modes, shape (N, N).
+
+    Returns
+    -------
+    Array
+        The symplectic transform, shape (2 * N, 2 * N).
+    """
+    r, i = jnp.real(unitary), jnp.imag(unitary)
+    return jnp.block([[r, -i], [i, r]])
+
+
+def _apply_real(func, a: ArrayLike) -> ArrayLike:
+    """Applies a real linear map to ``a``, one real matmul per component.
+
+    ``T`` is real, so a complex ``a`` (interference terms) is split into its
+    real and imaginary parts, which are transformed together in one batched
+    real matmul rather than promoting ``T`` to complex.
+    """
+    if not jnp.iscomplexobj(a):
+        return func(a)
+    out = func(jnp.stack([a.real, a.imag]))
+    return out[0] + 1j * out[1]
+
+
+def _transform_state(unitary: ArrayLike, means: ArrayLike, cov: ArrayLike):
+    """Applies a mode unitary to gaussian states in the xxpp convention.
+
+    Parameters
+    ----------
+    unitary : ArrayLike
+        The complex unitary acting on the modes, shape (N, N).
+    means : ArrayLike
+        The means of each state, shape (states, 2 * N).
+    cov : ArrayLike
+        The covariance matrix of each state, shape (states, 2 * N, 2 * N).
+
+    Returns
+    -------
+    means, cov
+        The transformed means and covariance matrices, same shapes as the
+        inputs.
+    """
+    t = _symplectic(unitary)
+    out_means = _apply_real(lambda m: m @ t.T, means)
+    out_cov = _apply_real(lambda c: t @ c @ t.T, cov)
+    return out_means, out_cov
+
+
 def apply_unitary(
     unitary: ArrayLike, qstate: QuantumState, modes: Union[int, List[int]]
 ) -> QuantumState:
@@ -469,25 +524,11 @@ def apply_unitary(
     if not all(mode < qstate.N for mode in modes):
         raise ValueError("Modes must be less than the number of modes.")
     modes = jnp.array(modes)
-    inds = jnp.concatenate((modes, (modes + qstate.N)))
 
     qstate.to_xxpp()
     weights, input_means, input_cov = qstate.modes(modes)
 
-    n = unitary.shape[0]
-    transform = jnp.zeros((n * 2, n * 2))
-
-    transform = transform.at[:n, :n].set(unitary.real)
-    transform = transform.at[:n, n:].set(-unitary.imag)
-    transform = transform.at[n:, :n].set(unitary.imag)
-    transform = transform.at[n:, n:].set(unitary.real)
-
-    output_means = []
-    output_cov = []
-
-    for i in range(qstate.states):
-        output_means.append(transform @ input_means[i].T)
-        output_cov.append(transform @ input_cov[i] @ transform.T)
+    output_means, output_cov = _transform_state(unitary, input_means, input_cov)
 
     # TODO: Possibly implement tolerance for small numbers
     # convert small numbers to zero
@@ -703,6 +744,7 @@ class QuantumSim(Simulation):
         if "wl" not in kwargs:
             raise ValueError("Must specify 'wl' (wavelengths to simulate).")
         super().__init__(ckt, kwargs["wl"])
+        self._padded_cache = None
 
     def add_qstate(self, qstate: QuantumState) -> None:
         """Add a quantum state to the simulation.
@@ -713,6 +755,7 @@ class QuantumSim(Simulation):
             The quantum state to add.
         """
         self.input = qstate
+        self._padded_cache = None
 
     @staticmethod
     def to_unitary(s_params):
@@ -733,42 +776,69 @@ class QuantumSim(Simulation):
             The unitary s-parameters of the shape (n_freq, 2*n_ports,
             2*n_ports).
         """
-        n_freqs, n_ports, _ = s_params.shape
-        new_n_ports = n_ports * 2
-        unitary = jnp.zeros((n_freqs, new_n_ports, new_n_ports), dtype=complex)
-        for f in range(n_freqs):
-            unitary = unitary.at[f, :n_ports, :n_ports].set(s_params[f])
-            unitary = unitary.at[f, n_ports:, n_ports:].set(s_params[f])
-            for i in range(n_ports):
-                val = jnp.sqrt(
-                    1 - unitary[f, :n_ports, i].dot(unitary[f, :n_ports, i].conj())
-                )
-                unitary = unitary.at[f, n_ports + i, i].set(val)
-                unitary = unitary.at[f, i, n_ports + i].set(-val)
+        s_params = jnp.asarray(s_params, dtype=complex)
+        n_ports = s_params.shape[-1]
+
+        # The loss of each input port is the norm missing from its column;
+        # it is coupled into (and out of) a dedicated vacuum port.
+        col_norms = jnp.sqrt(
+            1 - jnp.einsum("fij,fij->fj", s_params, jnp.conj(s_params))
+        )
+        vacuum = jnp.einsum("fj,ij->fij", col_norms, jnp.eye(n_ports))
+
+        unitary = jnp.concatenate(
+            [
+                jnp.concatenate([s_params, -vacuum], axis=2),
+                jnp.concatenate([vacuum, s_params], axis=2),
+            ],
+            axis=1,
+        )
 
         return unitary
 
     def run(self) -> QuantumResult:
         """Run the simulation."""
-        ports = get_ports(self.ckt())
-        n_ports = len(ports)
+        sdict = self._sdict()
+        port_index = self._port_index()
+        n_ports = len(port_index)
         # get the unitary s-parameters of the circuit
-        s_params = dict_to_matrix(self.ckt())
+        s_params = dict_to_matrix(sdict)
         unitary = self.to_unitary(s_params)
-        # get an array of the indices of the input ports
-        input_indices = [ports.index(port) for port in self.input.ports]
-        # create vacuum ports for each extra mode in the unitary matrix
         n_modes = unitary.shape[1]
-        n_vacuum = n_modes - len(input_indices)
-        self.input._add_vacuums(n_vacuum)
-        input_indices += [i for i in range(n_modes) if i not in input_indices]
+
+        # Padding the input with vacuums mutates it, so it must only happen
+        # once per input state; later runs reuse the padded modes. The state
+        # itself is kept so a replaced ``input`` is never mistaken for it.
+        cached = self._padded_cache
+        if cached is None or cached[0] is not self.input or cached[1] != n_modes:
+            # get an array of the indices of the input ports
+            for port in self.input.ports:
+                if port not in port_index:
+                    raise ValueError(f"'{port}' is not a port of the circuit.")
+            input_indices = [port_index[port] for port in self.input.ports]
+            # create vacuum ports for each extra mode in the unitary matrix
+            n_vacuum = n_modes - len(input_indices)
+            self.input._add_vacuums(n_vacuum)
+            used = set(input_indices)
+            input_indices += [i for i in range(n_modes) if i not in used]
+
+            # the input state is the same at every wavelength, so only the
+            # transform is batched over the wavelength axis
+            self.input.to_xxpp()
+            cached = (self.input, n_modes, self.input.modes(input_indices))
+            self._padded_cache = cached
+        weights, input_means, input_cov = cached[2]
+
+        means, cov = jax.vmap(_transform_state, in_axes=(0, None, None))(
+            unitary, input_means, input_cov
+        )
 
         output_states = []
         for wl_ind in range(len(self.wl)):
-            s_wl = unitary[wl_ind]
-
-            output_state = apply_unitary(s_wl, self.input, input_indices)
-
+            output_state = QuantumState(
+                means[wl_ind], cov[wl_ind], weights=weights, convention="xxpp"
+            )
+            output_state.to_xpxp()
             output_states.append(output_state)
 
         return QuantumResult(
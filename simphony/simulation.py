@@ -1,8 +1,10 @@
 """Simulation module."""
 
 import jax.numpy as jnp
+import sax
 from jax.typing import ArrayLike
 from sax.saxtypes import Model
+from sax.utils import get_ports
 
 
 class SimDevice:
@@ -27,6 +29,41 @@ class Simulation:
     def __init__(self, ckt: Model, wl: ArrayLike) -> None:
         self.ckt = ckt
         self.wl = jnp.asarray(wl).reshape(-1)
+        self._sdict_cache = None
+        self._port_index_cache = None
+
+    def _sdict(self) -> sax.SDict:
+        """Evaluate the circuit.
+
+        The circuit and all of its parameters, including the wavelengths, are
+        bound when the simulation is created, so the s-parameters are computed
+        once and reused across runs.
+
+        Returns
+        -------
+        sax.SDict
+            The s-parameters of the circuit.
+        """
+        if self._sdict_cache is None:
+            self._sdict_cache = self.ckt()
+        return self._sdict_cache
+
+    def _port_index(self) -> dict:
+        """Map each port of the circuit to its index.
+
+        The ordering matches ``sax.utils.get_ports`` and therefore the rows and
+        columns of ``simphony.utils.dict_to_matrix``. Like the s-parameters, it
+        is computed once and reused across runs.
+
+        Returns
+        -------
+        dict
+            A dictionary of port names to indices.
+        """
+        if self._port_index_cache is None:
+            ports = get_ports(self._sdict())
+            self._port_index_cache = {port: i for i, port in enumerate(ports)}
+        return self._port_index_cache
 
     def run(self):
         """Run the simulation."""
@@ -5,16 +5,19 @@
 to the average user."""
 
 import inspect
+import math
 import re
 
 import deprecation
+import jax
 import jax.numpy as jnp
+import numpy as np
 import sax
 from jax import Array
 from jax.typing import ArrayLike
 from sax.utils import get_ports
 from scipy.constants import c as SPEED_OF_LIGHT
-from scipy.interpolate import CubicSpline, interp1d
+from scipy.interpolate import CubicSpline
 from scipy.stats import multivariate_normal
 
 from simphony import __version__
@@ -33,6 +36,11 @@ MATH_SUFFIXES = {
     "T": "e12",
 }
 
+_SUFFIX_CHARS = np.array(list(MATH_SUFFIXES))
+_SUFFIX_EXPONENTS = np.array(list(MATH_SUFFIXES.values()))
+
+_NUM_RE = re.compile(r"([-+]?[0-9]+(?:[.][0-9]+)?)((?:[eE][-+]?[0-9]+)|(?:[a-zA-Z]))?")
+
 
 def rect(r: ArrayLike, phi: ArrayLike) -> Array:
     """Convert from polar to rectangular coordinates element-wise.
@@ -97,7 +105,7 @@ def add_polar(c1, c2):
     # this simulates the steady-state in time-domain
     wrapped1 = (phi1 // (2 * jnp.pi)) * (2 * jnp.pi)
     wrapped2 = (phi2 // (2 * jnp.pi)) * (2 * jnp.pi)
-    biggest = max(wrapped1, wrapped2)
+    biggest = jnp.maximum(wrapped1, wrapped2)
 
     return (mag, angle + biggest)
 
@@ -155,22 +163,18 @@ def mat_mul_polar(array1: ArrayLike, array2: ArrayLike) -> Array:
 
     The last number of dimensions is 2 if polar and 1 if rectangular. Complex
     rectangular data is of the form ``a + bj``. Complex polar data is of the
-    form ``[r, theta]``.
+    form ``[r, theta]``. The result is in the same form as the arguments.
     """
     # array1 and 2 should be identical in dimensions
     if jnp.shape(array1) != jnp.shape(array2):
         raise RuntimeError("Arrays must be the same shape to matrix multiply them")
 
-    # polar: multiply magnitudes, add angles, or convert to rectangular and call this function
+    # polar: multiply magnitudes, add angles
     if jnp.shape(array1)[-1] == 2:
-        real1 = array1[..., 0]
-        imag1 = array1[..., 1]
-        real2 = array2[..., 0]
-        imag2 = array2[..., 1]
-        rect1 = rect(real1, imag1)
-        rect2 = rect(real2, imag2)
-        # return real1*real2+imag1+imag2
-        return mat_mul_polar(rect1, rect2)
+        return jnp.stack(
+            [array1[..., 0] * array2[..., 0], array1[..., 1] + array2[..., 1]],
+            axis=-1,
+        )
 
     # rectangular: simply multiply them
     return array1 * array2
@@ -208,22 +212,22 @@ def mat_add_polar(array1: ArrayLike, array2: ArrayLike) -> Array:
 
     The last number of dimensions is 2 if polar and 1 if rectangular. Complex
     rectangular data is of the form ``a + bj``. Complex polar data is of the
-    form ``[r, theta]``.
+    form ``[r, theta]``. The result is in the same form as the arguments.
     """
 
     # array1 and 2 should be identical in dimensions
     if jnp.shape(array1) != jnp.shape(array2):
         raise RuntimeError("Arrays must be the same shape to matrix multiply them")
 
-    # polar: convert to rectangular, then return this function
+    # polar: r1 e^(i phi1) + r2 e^(i phi2) = e^(i phi2) (r1 e^(i dphi) + r2),
+    # which needs a single sin/cos pair per element
     if jnp.shape(array1)[-1] == 2:
-        real1 = array1[..., 0]
-        imag1 = array1[..., 1]
-        real2 = array2[..., 0]
-        imag2 = array2[..., 1]
-        rect1 = rect(real1, imag1)
-        rect2 = rect(real2, imag2)
-        return mat_add_polar(rect1, rect2)
+        r1, phi1 = array1[..., 0], array1[..., 1]
+        r2, phi2 = array2[..., 0], array2[..., 1]
+        dphi = phi1 - phi2
+        re = r1 * jnp.cos(dphi) + r2
+        im = r1 * jnp.sin(dphi)
+        return jnp.stack([jnp.hypot(re, im), phi2 + jnp.arctan2(im, re)], axis=-1)
 
     # rectangular: simply add them
     return array1 + array2
@@ -273,10 +277,18 @@ def str2float(num: str) -> float:
     >>> str2float('0.4E6')
     400000.0
     """
-    matches = re.findall(
-        r"([-+]?[0-9]+(?:[.][0-9]+)?)((?:[eE][-+]?[0-9]+)|(?:[a-zA-Z]))?", num
-    )
-    if len(matches) > 1:
+    # most values are plain float literals and don't need the regex, but
+    # float() also accepts nan, inf and 1_000, which are left to the regex
+    try:
+        value = float(num)
+    except (TypeError, ValueError):
+        pass
+    else:
+        if "_" not in num and math.isfinite(value):
+            return value
+
+    matches = _NUM_RE.findall(num)
+    if len(matches) != 1:
         raise ValueError(f"'{num}' is malformed")
     num, suffix = matches[0]
     try:
@@ -288,6 +300,76 @@ def str2float(num: str) -> float:
         raise ValueError(f"Suffix {str(e)} in '{matches[0]}' not recognized.")
 
 
+def str2float_array(nums: ArrayLike) -> np.ndarray:
+    """Converts an array of numbers represented as strings to floats.
+
+    This is the vectorized counterpart of :func:`str2float`. Suffixes are
+    swapped for their exponents with array operations and the whole array is
+    converted at once, instead of parsing each string in Python. Strings that
+    can't be converted that way (such as ``'1.5mm'`` or ``' 5k '``) are
+    passed to :func:`str2float` one at a time, so the same inputs are
+    accepted and rejected. The only values that can differ are from strings
+    that :func:`str2float` reads by skipping characters, such as ``'.5k'``.
+
+    Parameters
+    ----------
+    nums : ArrayLike
+        An array of strings representing numbers, optionally with suffixes.
+
+    Returns
+    -------
+    np.ndarray
+        The strings converted to floats, in the same shape as ``nums``.
+
+    Raises
+    ------
+    ValueError
+        If any element is malformed or has an unrecognized suffix.
+
+    Examples
+    --------
+    >>> str2float_array(["14.5c", "2.53", "0.4E6", "-0.257k"])
+    array([ 1.45e-01,  2.53e+00,  4.00e+05, -2.57e+02])
+    """
+    nums = np.asarray(nums, dtype=str)
+    flat = np.ascontiguousarray(nums.reshape(-1))
+    width = flat.dtype.itemsize // np.dtype("U1").itemsize
+    if flat.size == 0 or width == 0:
+        return flat.astype(float).reshape(nums.shape)
+
+    # split every string into characters and look at the last one
+    chars = flat.view("U1").reshape(-1, width).copy()
+    rows = np.arange(flat.size)
+    last = np.maximum(np.char.str_len(flat) - 1, 0)
+    match = chars[rows, last][:, None] == _SUFFIX_CHARS
+    has_suffix = match.any(axis=1)
+
+    # drop the suffix and append its exponent instead
+    chars[rows[has_suffix], last[has_suffix]] = ""
+    base = chars.view(f"U{width}").reshape(-1)
+    exponents = np.where(has_suffix, _SUFFIX_EXPONENTS[match.argmax(axis=1)], "")
+    converted = np.char.add(base, exponents)
+    try:
+        values = converted.astype(float)
+    except ValueError:
+        values = np.array([_float_or_nan(num) for num in converted])
+
+    # anything the vectorized conversion could not handle exactly as
+    # str2float would (unparsed, non-finite or underscored strings) is
+    # handed to str2float itself
+    retry = ~np.isfinite(values) | (np.char.find(flat, "_") >= 0)
+    values[retry] = [str2float(num) for num in flat[retry]]
+    return values.reshape(nums.shape)
+
+
+def _float_or_nan(num: str) -> float:
+    """Converts a string to a float, returning nan if it can't be parsed."""
+    try:
+        return float(num)
+    except ValueError:
+        return math.nan
+
+
 def freq2wl(freq: ArrayLike) -> Array:
     """Convenience function for converting from frequency to wavelength.
 
@@ -337,6 +419,57 @@ def wlum2freq(wl: ArrayLike) -> Array:
     return wl2freq(wl * 1e-6)
 
 
+@jax.jit
+def _cubic_interp(x: ArrayLike, xp: ArrayLike, fp: ArrayLike) -> Array:
+    """Piecewise cubic Hermite interpolation along the first axis of ``fp``.
+
+    Tangents are Catmull-Rom style finite differences (one-sided at the ends),
+    so the interpolant passes through every sample and has a continuous first
+    derivative. Points outside ``xp`` are extrapolated from the end segments.
+
+    Parameters
+    ----------
+    x : ArrayLike
+        The x-coordinates at which to evaluate the interpolated values.
+    xp : ArrayLike
+        The x-coordinates of the data points, must be increasing.
+    fp : ArrayLike
+        The values at ``xp``, indexed along the first axis.
+
+    Returns
+    -------
+    Array
+        The interpolated values, shape ``x.shape + fp.shape[1:]``.
+    """
+    x, xp, fp = jnp.asarray(x), jnp.asarray(xp), jnp.asarray(fp)
+
+    def expand(a):
+        return a.reshape(a.shape + (1,) * (fp.ndim - 1))
+
+    dx = jnp.diff(xp)
+    secant = jnp.diff(fp, axis=0) / expand(dx)
+    central = (fp[2:] - fp[:-2]) / expand(xp[2:] - xp[:-2])
+    m = jnp.concatenate([secant[:1], central, secant[-1:]], axis=0)
+
+    i = jnp.clip(jnp.searchsorted(xp, x, side="right") - 1, 0, len(xp) - 2)
+    h = dx[i]
+    t = (x - xp[i]) / h
+    t2 = t * t
+    t3 = t2 * t
+
+    h00 = 2 * t3 - 3 * t2 + 1
+    h10 = (t3 - 2 * t2 + t) * h
+    h01 = -2 * t3 + 3 * t2
+    h11 = (t3 - t2) * h
+
+    return (
+        expand(h00) * fp[i]
+        + expand(h10) * m[i]
+        + expand(h01) * fp[i + 1]
+        + expand(h11) * m[i + 1]
+    )
+
+
 @deprecation.deprecated(
     deprecated_in="0.7.0",
     removed_in="0.8.0",
@@ -366,9 +499,33 @@ def interpolate(
     result : Array
         The values of the interpolated function (fitted to the input
         s-parameters) evaluated at the ``output_freq`` frequencies.
+
+    Raises
+    ------
+    ValueError
+        If any of the ``output_freq`` frequencies lie outside the range of
+        ``input_freq``.
+
+    Notes
+    -----
+    ``input_freq`` may be given in any order (frequencies computed from an
+    ascending wavelength sweep are descending, for example); it is sorted,
+    with the s-parameters reordered to match, before interpolating.
     """
-    func = interp1d(sampled, s_parameters, kind="cubic", axis=0)
-    return func(resampled)
+    resampled = np.asarray(resampled, dtype=float)
+    sampled = np.asarray(sampled, dtype=float)
+    order = np.argsort(sampled)
+    sampled = sampled[order]
+    s_parameters = np.asarray(s_parameters)[order]
+    if np.any(resampled < sampled[0]) or np.any(resampled > sampled[-1]):
+        raise ValueError("A value in output_freq is outside the interpolation range.")
+
+    # Frequencies are ~1e14 Hz but JAX computes in single precision by
+    # default, so map the grid onto [0, 1] in double precision first.
+    start, span = sampled[0], sampled[-1] - sampled[0]
+    return _cubic_interp(
+        (resampled - start) / span, (sampled - start) / span, s_parameters
+    )
 
 
 def xxpp_to_xpxp(xxpp: ArrayLike) -> Array:
@@ -431,13 +588,23 @@ def dict_to_matrix(sdict: sax.SDict) -> Array:
         ``sax.utils.get_ports``, shape :math:`(f \times n \times n)`.
     """
     ports = get_ports(sdict)
+    port_index = {port: i for i, port in enumerate(ports)}
     arr = list(sdict.values())[0]
     arr = jnp.asarray(arr).reshape(-1)
     smat = jnp.zeros((len(arr), len(ports), len(ports)), dtype=complex)
 
-    for k, v in sdict.items():
-        i, j = ports.index(k[0]), ports.index(k[1])
-        smat = smat.at[:, i, j].set(v)
+    # Scatter every entry in a single update instead of copying ``smat`` once
+    # per key.
+    rows = jnp.array([port_index[p_out] for p_out, _ in sdict])
+    cols = jnp.array([port_index[p_in] for _, p_in in sdict])
+    vals = jnp.stack(
+        [
+            jnp.broadcast_to(jnp.asarray(v).reshape(-1), arr.shape)
+            for v in sdict.values()
+        ],
+        axis=-1,
+    )
+    smat = smat.at[:, rows, cols].set(vals)
 
     return smat
 
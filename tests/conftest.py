@@ -2,6 +2,15 @@ from pathlib import Path
 
 import pytest
 import numpy as np
+import sax
+
+from simphony.libraries import ideal
+
+# Shared, read-only wavelength grids so no test can alter them for the others.
+_STD_WL_UM = np.linspace(1.5, 1.6, 1000)
+_STD_WL_UM.setflags(write=False)
+_STD_WL = _STD_WL_UM * 1e-6
+_STD_WL.setflags(write=False)
 
 
 @pytest.fixture
@@ -9,11 +18,39 @@ def data_dir():
     return Path(__file__).parent / "data"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def std_wl_um():
-    return np.linspace(1.5, 1.6, 1000)
+    return _STD_WL_UM
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def std_wl():
-    return np.linspace(1.5, 1.6, 1000) * 1e-6
+    return _STD_WL
+
+
+@pytest.fixture(scope="session")
+def mzi():
+    ckt, _ = sax.circuit(
+        netlist={
+            "instances": {
+                "lft": "coupler",
+                "top": "waveguide",
+                "bot": "waveguide",
+                "rgt": "coupler",
+            },
+            "connections": {
+                "lft,o1": "bot,o0",
+                "bot,o1": "rgt,o0",
+                "lft,o3": "top,o0",
+                "top,o1": "rgt,o2",
+            },
+            "ports": {
+                "in0": "lft,o0",
+                "in1": "lft,o2",
+                "out0": "rgt,o1",
+                "out1": "rgt,o3",
+            },
+        },
+        models={"coupler": ideal.coupler, "waveguide": ideal.waveguide},
+    )
+    return ckt
@@ -1,43 +1,161 @@
+import importlib.util
+
+import numpy as np
 import pytest
 
-try:
-    from simphony.libraries import sipann
-except ImportError:
-    SIPANN_AVAILABLE = False
+SIPANN_AVAILABLE = importlib.util.find_spec("SiPANN") is not None
 
+pytestmark = pytest.mark.skipif(not SIPANN_AVAILABLE, reason="SiPANN not installed")
 
-class TestGapFuncSymmetric:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.gap_func_symmetric(
-                width=350,
-                thickness=160,
-                gap=(lambda x: x * 3),
-                dgap=(lambda x: 3),
-                zmin=0.0,
-                zmax=1.0,
-            )
-
-    def test_instantiable(self):
-        sipann.gap_func_symmetric(
+
+def _gap(x):
+    return x * 3
+
+
+def _dgap(x):
+    return 3
+
+
+# Each entry is (factory, valid parameters, invalid parameters).
+MODELS = [
+    (
+        "gap_func_symmetric",
+        dict(
             width=500,
             thickness=220,
-            gap=(lambda x: x * 3),
-            dgap=(lambda x: 3),
+            gap=_gap,
+            dgap=_dgap,
             zmin=0.0,
             zmax=1.0,
-        )
-
-    def test_s_params(self, std_wl_um):
-        s_dict = sipann.gap_func_symmetric(
-            wl=std_wl_um,
-            width=500,
-            thickness=220,
-            gap=(lambda x: x * 3),
-            dgap=(lambda x: 3),
+        ),
+        dict(
+            width=350,
+            thickness=160,
+            gap=_gap,
+            dgap=_dgap,
             zmin=0.0,
             zmax=1.0,
-        )
+        ),
+    ),
+    (
+        "half_ring",
+        dict(width=500, thickness=220, radius=5000, gap=100),
+        dict(width=350, thickness=160, radius=5000, gap=50),
+    ),
+    (
+        "straight_coupler",
+        dict(width=500, thickness=220, gap=180, length=1000),
+        dict(width=400, thickness=160, gap=50, length=1000),
+    ),
+    (
+        "standard_coupler",
+        dict(
+            width=500,
+            thickness=220,
+            gap=180,
+            length=2000,
+            horizontal=2000,
+            vertical=2000,
+        ),
+        dict(
+            width=399,
+            thickness=240.1,
+            gap=180,
+            length=2000,
+            horizontal=2000,
+            vertical=2000,
+        ),
+    ),
+    (
+        "double_half_ring",
+        dict(width=500, thickness=220, radius=5000, gap=100),
+        dict(width=380, thickness=250, radius=5000, gap=100),
+    ),
+    (
+        "angled_half_ring",
+        dict(width=500, thickness=220, radius=5000, gap=150, theta=0.5),
+        dict(width=375, thickness=175, radius=5000, gap=150, theta=0.5),
+    ),
+    (
+        "waveguide",
+        dict(width=500, thickness=220, length=10000),
+        dict(width=350, thickness=250, length=10000),
+    ),
+    (
+        "racetrack",
+        dict(width=500, thickness=220, radius=5000, gap=150, length=2000),
+        dict(width=625, thickness=175, radius=5000, gap=80, length=5000),
+    ),
+]
+
+
+@pytest.fixture(scope="session")
+def sipann():
+    # SiPANN pulls in TensorFlow, so only import it once a test needs it.
+    from simphony.libraries import sipann
+
+    return sipann
+
+
+@pytest.fixture(scope="session")
+def sdicts(sipann, std_wl_um):
+    # Evaluate every model once over the standard wavelength grid up front so
+    # all s-parameter checks share a single forward pass per model.
+    return {
+        factory: getattr(sipann, factory)(wl=std_wl_um, **valid)
+        for factory, valid, _ in MODELS
+    }
+
+
+@pytest.mark.parametrize("factory, valid, invalid", MODELS)
+class TestModels:
+    def test_invalid_parameters(self, sipann, factory, valid, invalid):
+        with pytest.raises(ValueError):
+            getattr(sipann, factory)(**invalid)
+
+    def test_instantiable(self, sipann, factory, valid, invalid):
+        getattr(sipann, factory)(**valid)
+
+    def test_s_params(self, std_wl_um, sdicts, factory, valid, invalid):
+        for s in sdicts[factory].values():
+            assert s.shape == std_wl_um.shape
+
+
+def test_cached(sipann, std_wl_um):
+    first = sipann.waveguide(wl=std_wl_um, width=500, thickness=220)
+    first[("o0", "o1")][:] = 0
+    second = sipann.waveguide(wl=std_wl_um, width=500, thickness=220)
+    assert second.keys() == first.keys()
+    assert second[("o0", "o1")].any()
+
+
+def test_cache_eviction(sipann, monkeypatch):
+    calls = []
+    create = sipann._create_sdict_from_model
+
+    def counting_create(model, wl):
+        calls.append(wl)
+        return create(model, wl)
+
+    monkeypatch.setattr(sipann, "_create_sdict_from_model", counting_create)
+    monkeypatch.setattr(sipann, "_CACHE_SIZE", 2)
+    sipann.waveguide.cache_clear()
+    for length in [1000, 2000, 3000, 1000]:
+        sipann.waveguide(width=500, thickness=220, length=length)
+    assert len(calls) == 4
+
+    # 3000 is still cached, 2000 was evicted when 1000 was re-added
+    sipann.waveguide(width=500, thickness=220, length=3000)
+    assert len(calls) == 4
+    sipann.waveguide(width=500, thickness=220, length=2000)
+    assert len(calls) == 5
+    sipann.waveguide.cache_clear()
+
+
+def test_uncacheable(sipann):
+    with pytest.raises(TypeError):
+        sipann._freeze([len, abs])
+    assert sipann._freeze([1.5, 1.6]) == sipann._freeze(np.array([1.5, 1.6]))
 
 
 # class TestGapFuncAntiSymmetric:
@@ -53,20 +171,6 @@ class TestGapFuncSymmetric:
 #         s = dc.s_params(std_wl_um)
 
 
-class Testhalf_ring:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.half_ring(width=350, thickness=160, radius=5000, gap=50)
-
-    def test_instantiable(self):
-        sipann.half_ring(width=500, thickness=220, radius=5000, gap=100)
-
-    def test_s_params(self, std_wl_um):
-        s_params = sipann.half_ring(
-            wl=std_wl_um, width=500, thickness=220, radius=5000, gap=100
-        )
-
-
 # class TestHalfracetrack:
 #    def test_invalid_parameters(self):
 #        with pytest.raises(ValueError):
@@ -86,112 +190,6 @@ class Testhalf_ring:
 #        dev.s_params(std_wl_um)
 
 
-class Teststraight_coupler:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.straight_coupler(width=400, thickness=160, gap=50, length=1000)
-
-    def test_instantiable(self):
-        sipann.straight_coupler(width=500, thickness=220, gap=150, length=1000)
-
-    def test_s_params(self, std_wl_um):
-        s_dict = sipann.straight_coupler(
-            wl=std_wl_um, width=500, thickness=220, gap=180, length=1000
-        )
-
-
-class Teststandard_coupler:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.standard_coupler(
-                width=399,
-                thickness=240.1,
-                gap=180,
-                length=2000,
-                horizontal=2000,
-                vertical=2000,
-            )
-
-    def test_instantiable(self):
-        sipann.standard_coupler(
-            width=500,
-            thickness=220,
-            gap=180,
-            length=2000,
-            horizontal=2000,
-            vertical=2000,
-        )
-
-    def test_s_params(self, std_wl_um):
-        s_dict = sipann.standard_coupler(
-            wl=std_wl_um,
-            width=500,
-            thickness=220,
-            gap=180,
-            length=2000,
-            horizontal=2000,
-            vertical=2000,
-        )
-
-
-class Testdouble_half_ring:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.double_half_ring(width=380, thickness=250, radius=5000, gap=100)
-
-    def test_instantiable(self):
-        sipann.double_half_ring(width=500, thickness=220, radius=5000, gap=100)
-
-    def test_s_params(self, std_wl_um):
-        s_dict = sipann.double_half_ring(
-            wl=std_wl_um, width=500, thickness=220, radius=5000, gap=100
-        )
-
-
-class Testangled_half_ring:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.angled_half_ring(
-                width=375, thickness=175, radius=5000, gap=150, theta=0.5
-            )
-
-    def test_instantiable(self):
-        sipann.angled_half_ring(
-            width=500, thickness=220, radius=5000, gap=150, theta=0.5
-        )
-
-    def test_s_params(self, std_wl_um):
-        sdict = sipann.angled_half_ring(
-            wl=std_wl_um, width=500, thickness=220, radius=5000, gap=150, theta=0.5
-        )
-
-
-class Testwaveguide:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.waveguide(width=350, thickness=250, length=10000)
-
-    def test_instantiable(self):
-        sipann.waveguide(width=500, thickness=220, length=10000)
-
-    def test_s_params(self, std_wl_um):
-        sdict = sipann.waveguide(wl=std_wl_um, width=500, thickness=220, length=10000)
-
-
-class Testracetrack:
-    def test_invalid_parameters(self):
-        with pytest.raises(ValueError):
-            sipann.racetrack(width=625, thickness=175, radius=5000, gap=80, length=5000)
-
-    def test_instantiable(self):
-        sipann.racetrack(width=500, thickness=220, radius=5000, gap=150, length=2000)
-
-    def test_s_params(self, std_wl_um):
-        s_dict = sipann.racetrack(
-            wl=std_wl_um, width=500, thickness=220, radius=5000, gap=150, length=2000
-        )
-
-
 # class TestPremadeCoupler:
 #     def test_invalid_parameters(self):
 #         with pytest.raises(ValueError):
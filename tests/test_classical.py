@@ -0,0 +1,39 @@
+# Copyright © Simphony Project Contributors
+# Licensed under the terms of the MIT License
+# (see simphony/__init__.py for details)
+
+import numpy as np
+
+from simphony.classical import ClassicalSim
+
+
+class TestClassicalSim:
+    def test_run(self, mzi, std_wl_um):
+        params = dict(top={"length": 150.0, "loss": 3.0}, bot={"length": 50.0})
+        sim = ClassicalSim(ckt=mzi, wl=std_wl_um, **params)
+        sim.add_laser("in0", power=1.0)
+        sim.add_laser("in1", power=0.5, phase=0.3)
+        det0, det1 = sim.add_detector(["out0", "out1"])
+        result = sim.run()
+
+        sdict = mzi(wl=std_wl_um, **params)
+        for port, det in [("out0", det0), ("out1", det1)]:
+            field = (
+                sdict[port, "in0"] + np.sqrt(0.5) * np.exp(0.3j) * sdict[port, "in1"]
+            )
+            assert result.sdict[port].shape == std_wl_um.shape
+            assert np.allclose(result.sdict[port], field, atol=1e-5)
+            assert np.allclose(det.power, np.abs(field) ** 2, atol=1e-5)
+
+    def test_no_detectors(self, mzi, std_wl_um):
+        sim = ClassicalSim(ckt=mzi, wl=std_wl_um)
+        sim.add_laser("in0", power=1.0)
+        assert sim.run().sdict == {}
+
+    def test_no_lasers(self, mzi, std_wl_um):
+        sim = ClassicalSim(ckt=mzi, wl=std_wl_um)
+        (det,) = sim.add_detector("out0")
+        result = sim.run()
+        assert list(result.sdict) == ["out0"]
+        assert not np.any(result.sdict["out0"])
+        assert not np.any(det.power)
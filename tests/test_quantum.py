@@ -0,0 +1,132 @@
+# Copyright © Simphony Project Contributors
+# Licensed under the terms of the MIT License
+# (see simphony/__init__.py for details)
+
+import numpy as np
+import pytest
+
+from simphony import quantum
+from simphony.quantum import (
+    CoherentState,
+    QuantumSim,
+    SqueezedState,
+    _transform_state,
+    compose_qstate,
+)
+
+
+def random_unitary(rng, n):
+    z = rng.normal(size=(n, n)) + 1j * rng.normal(size=(n, n))
+    q, r = np.linalg.qr(z)
+    return q * (np.diag(r) / np.abs(np.diag(r)))
+
+
+def symplectic(unitary):
+    r, i = unitary.real, unitary.imag
+    return np.block([[r, -i], [i, r]])
+
+
+class TestTransformState:
+    rng = np.random.default_rng(0)
+    unitary = random_unitary(rng, 3)
+
+    def check(self, means, cov):
+        out_means, out_cov = _transform_state(self.unitary, means, cov)
+        t = symplectic(self.unitary)
+        assert np.allclose(out_means, means @ t.T, atol=1e-5)
+        assert np.allclose(out_cov, t @ cov @ t.T, atol=1e-5)
+
+    def test_real(self):
+        means = self.rng.normal(size=(2, 6))
+        a = self.rng.normal(size=(2, 6, 6))
+        self.check(means, a @ np.swapaxes(a, -1, -2))
+
+    def test_complex(self):
+        # interference terms of cat states have complex means and covariances
+        means = self.rng.normal(size=(2, 6)) + 1j * self.rng.normal(size=(2, 6))
+        cov = self.rng.normal(size=(2, 6, 6)) + 1j * self.rng.normal(size=(2, 6, 6))
+        self.check(means, cov)
+
+
+def test_to_unitary():
+    rng = np.random.default_rng(1)
+    # lossy, with a different loss on every input port
+    loss = np.array([0.9, 0.5, 0.7])
+    s_params = np.stack([random_unitary(rng, 3) * loss for _ in range(4)])
+
+    # reference construction, one frequency and port at a time
+    n_freqs, n_ports, _ = s_params.shape
+    expected = np.zeros((n_freqs, 2 * n_ports, 2 * n_ports), dtype=complex)
+    for f in range(n_freqs):
+        expected[f, :n_ports, :n_ports] = s_params[f]
+        expected[f, n_ports:, n_ports:] = s_params[f]
+        for i in range(n_ports):
+            col = s_params[f, :, i]
+            val = np.sqrt(1 - col.dot(col.conj()))
+            expected[f, n_ports + i, i] = val
+            expected[f, i, n_ports + i] = -val
+
+    unitary = np.asarray(QuantumSim.to_unitary(s_params))
+    assert np.allclose(unitary, expected, atol=1e-6)
+
+
+def make_sim(mzi):
+    return QuantumSim(
+        ckt=mzi,
+        wl=np.linspace(1.5, 1.6, 5),
+        top={"length": 150.0, "loss": 3.0},
+        bot={"length": 50.0},
+    )
+
+
+@pytest.fixture
+def sim(mzi):
+    return make_sim(mzi)
+
+
+class TestQuantumSim:
+    def test_rerun(self, sim):
+        sim.add_qstate(
+            compose_qstate(
+                SqueezedState("in1", 0.4, 0.3), CoherentState("in0", 0.3 - 1j)
+            )
+        )
+        first = sim.run()
+        n_modes = first.input_state.N
+        second = sim.run()
+        assert second.input_state.N == n_modes
+        for a, b in zip(first.output_states, second.output_states):
+            assert np.array_equal(a.means, b.means)
+            assert np.array_equal(a.cov, b.cov)
+
+    def test_add_qstate_resets(self, sim):
+        sim.add_qstate(CoherentState("in0", 1 + 0.5j))
+        sim.run()
+        sim.add_qstate(CoherentState("in1", 1 + 0.5j))
+        assert sim._padded_cache is None
+        result = sim.run()
+        assert result.input_state.ports[0] == "in1"
+        assert result.input_state.N == 8
+
+    def test_unknown_port(self, sim):
+        sim.add_qstate(CoherentState("nope", 1.0))
+        with pytest.raises(ValueError):
+            sim.run()
+
+    def test_replaced_input(self, mzi, sim, monkeypatch):
+        # make every state look like the one before it, as when a collected
+        # state's id is reused by its replacement
+        monkeypatch.setattr(quantum, "id", lambda obj: 0, raising=False)
+        sim.add_qstate(CoherentState("in0", 1 + 0.5j))
+        sim.run()
+        # assigning the attribute directly bypasses add_qstate
+        sim.input = CoherentState("in1", 0.2)
+        result = sim.run()
+        assert result.input_state is sim.input
+        assert result.input_state.N == 8
+
+        fresh = make_sim(mzi)
+        fresh.add_qstate(CoherentState("in1", 0.2))
+        for a, b in zip(result.output_states, fresh.run().output_states):
+            assert np.array_equal(a.means, b.means)
+            assert np.array_equal(a.cov, b.cov)
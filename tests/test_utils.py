@@ -2,9 +2,21 @@
 # Licensed under the terms of the MIT License
 # (see simphony/__init__.py for details)
 
+import numpy as np
 import pytest
+from scipy.interpolate import interp1d
 
-from simphony.utils import str2float, wl2freq, freq2wl, wlum2freq
+from simphony.utils import (
+    dict_to_matrix,
+    interpolate,
+    mat_add_polar,
+    mat_mul_polar,
+    str2float,
+    str2float_array,
+    wl2freq,
+    freq2wl,
+    wlum2freq,
+)
 
 
 def test_wl2freq():
@@ -28,6 +40,67 @@ def test_wlum2freq():
     assert wlum2freq(3) == wl2freq(3e-6)
 
 
+def test_dict_to_matrix():
+    sdict = {
+        ("o0", "o0"): np.array([0.1, 0.2]),
+        ("o0", "o1"): np.array([0.5j, 0.6j]),
+        ("o1", "o0"): 0.7,
+    }
+    smat = dict_to_matrix(sdict)
+    assert smat.shape == (2, 2, 2)
+    assert np.allclose(smat[:, 0, 0], [0.1, 0.2])
+    assert np.allclose(smat[:, 0, 1], [0.5j, 0.6j])
+    assert np.allclose(smat[:, 1, 0], [0.7, 0.7])
+    assert np.allclose(smat[:, 1, 1], 0)
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+class TestInterpolate:
+    wl = np.linspace(1.5, 1.6, 1000)
+    freq = wlum2freq(wl)
+    s_params = np.stack([np.exp(40j * wl), np.cos(30 * wl) + 0j], axis=1)
+    resampled = np.linspace(freq.min(), freq.max(), 333)
+
+    def expected(self):
+        func = interp1d(self.freq, self.s_params, kind="cubic", axis=0)
+        return func(self.resampled)
+
+    def test_ascending(self):
+        result = interpolate(self.resampled, self.freq[::-1], self.s_params[::-1])
+        assert result.shape == (333, 2)
+        assert np.allclose(result, self.expected(), rtol=0, atol=2e-6)
+
+    def test_descending(self):
+        result = interpolate(self.resampled, self.freq, self.s_params)
+        assert result.shape == (333, 2)
+        assert np.allclose(result, self.expected(), rtol=0, atol=2e-6)
+
+    def test_out_of_range(self):
+        with pytest.raises(ValueError):
+            interpolate(self.freq.max() * 1.01, self.freq, self.s_params)
+
+
+class TestPolar:
+    a = np.array([[[0.5, 0.3], [1.0, -2.0]], [[0.2, 7.0], [0.9, 1.5]]])
+    b = np.array([[[0.7, -1.1], [0.4, 4.0]], [[1.0, 0.0], [0.3, -6.0]]])
+
+    @staticmethod
+    def to_complex(x):
+        return x[..., 0] * np.exp(1j * x[..., 1])
+
+    def test_mat_mul_polar(self):
+        result = np.asarray(mat_mul_polar(self.a, self.b))
+        assert result.shape == self.a.shape
+        expected = self.to_complex(self.a) * self.to_complex(self.b)
+        assert np.allclose(self.to_complex(result), expected, atol=1e-6)
+
+    def test_mat_add_polar(self):
+        result = np.asarray(mat_add_polar(self.a, self.b))
+        assert result.shape == self.a.shape
+        expected = self.to_complex(self.a) + self.to_complex(self.b)
+        assert np.allclose(self.to_complex(result), expected, atol=1e-6)
+
+
 class TestString2Float:
     def test_no_suffix(self):
         assert str2float("2.53") == 2.53
@@ -75,3 +148,40 @@ class TestString2Float:
     def test_malformed(self):
         with pytest.raises(ValueError):
             str2float("17.3.5e7")
+
+    @pytest.mark.parametrize("num", ["nan", "inf", "-infinity", "1_000"])
+    def test_non_finite_and_underscore(self, num):
+        with pytest.raises(ValueError):
+            str2float(num)
+
+    def test_overflow(self):
+        assert str2float("1e400") == float("inf")
+
+
+class TestString2FloatArray:
+    def test_matches_str2float(self):
+        nums = ["2.53", "17.83f", "-15.37p", "15.26u", "14.5c", "-0.257k"]
+        nums += ["15.26M", "-8.73G", "183.4T", "15.2e-6", "0.4E6", "5"]
+        assert str2float_array(nums).tolist() == [str2float(n) for n in nums]
+
+    def test_shape(self):
+        result = str2float_array([["1k", "2"], ["3m", "4.5e1"]])
+        assert result.shape == (2, 2)
+        assert result.tolist() == [[1e3, 2.0], [3e-3, 45.0]]
+
+    def test_unrecognized(self):
+        with pytest.raises(ValueError):
+            str2float_array(["1.0", "17.3o"])
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            str2float_array(["17.3.5e7"])
+
+    def test_fallback(self):
+        nums = ["1.5mm", "1e-3k", " 5k ", "1e400", "2.5"]
+        assert str2float_array(nums).tolist() == [str2float(n) for n in nums]
+
+    @pytest.mark.parametrize("num", ["nan", "inf", "-infinity", "1_000"])
+    def test_non_finite_and_underscore(self, num):
+        with pytest.raises(ValueError):
+            str2float_array(["1.0", num])